@@ -4,37 +4,99 @@ Handles all input validation and data transformation.
 """
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
+import os
 import re
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, create_engine
+import orjson
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text, JSON, Index, create_engine, event
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 import datetime
 import bcrypt
 
 Base = declarative_base()
 
-# SQLite setup for local dev
-engine = create_engine('sqlite:///literate_spoon.db', echo=False)
+# Precompiled validation patterns. Binding the compiled pattern once avoids
+# re.match's per-call lookup in the module-level pattern cache.
+_ALLERGY_RE = re.compile(r"^[a-z0-9\s\-]+$")
+
+# bcrypt work factor. bcrypt>=4 ships a fast Rust backend; the cost is
+# env-tunable so login/signup latency stays within an explicit budget
+# instead of drifting with library defaults.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Macro split (protein, carbs, fats fractions of TDEE) per goal profile,
+# resolved by the first matching keyword in the user's diet goals.
+_MACRO_PROFILES = {
+    "weight_loss": (0.30, 0.40, 0.30),
+    "muscle": (0.35, 0.45, 0.20),
+    "balanced": (0.30, 0.40, 0.30),
+}
+_GOAL_KEYWORDS = (
+    ("weight loss", "weight_loss"),
+    ("muscle", "muscle"),
+    ("gain", "muscle"),
+)
+
+# SQLite setup for local dev. JSON columns go through orjson, which is
+# markedly faster than stdlib json on the meal/item blobs stored here.
+# Pool sizing is env-tunable so threaded gunicorn workers don't queue on
+# the default 5-connection pool; pre-ping silently drops stale handles
+# and LIFO reuse keeps hot connections (and their page caches) warm.
+engine = create_engine(
+    'sqlite:///literate_spoon.db',
+    echo=False,
+    json_serializer=lambda obj: orjson.dumps(obj).decode(),
+    json_deserializer=orjson.loads,
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_POOL_OVERFLOW", "30")),
+    pool_timeout=30,
+    pool_recycle=1800,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+    """Tune SQLite for concurrent web traffic.
+
+    WAL lets readers proceed during writes, synchronous=NORMAL drops the
+    per-commit fsync (safe under WAL), and the mmap/cache settings keep hot
+    pages out of the page-cache copy path.
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
 SessionLocal = sessionmaker(bind=engine)
 
 class User(Base):
     __tablename__ = 'users'
     id = Column(Integer, primary_key=True)
-    email = Column(String(255), unique=True, nullable=False)
+    email = Column(String(255), unique=True, nullable=False)  # unique=True implies an index
     password_hash = Column(String(255), nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     role = Column(String(32), default='user')
     is_active = Column(Boolean, default=True)
     last_login = Column(DateTime, nullable=True)
-    profile = relationship('Profile', uselist=False, back_populates='user')
+    # joined load: the hot paths fetch exactly one User and immediately
+    # read .profile, so a single SELECT with a JOIN beats the lazy (or
+    # batched selectin) second query.
+    profile = relationship('Profile', uselist=False, back_populates='user', lazy='joined')
 
     def verify_password(self, password: str) -> bool:
         return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
 
     @staticmethod
     def hash_password(password: str) -> str:
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode('utf-8')
 
 class Profile(Base):
     __tablename__ = 'profiles'
@@ -50,7 +112,7 @@ class Profile(Base):
     bio = Column(Text)
     height_cm = Column(Integer)
     weight_kg = Column(Integer)
-    allergies = Column(Text)  # store as JSON string
+    allergies = Column(JSON)  # JSON array of allergen strings
     food_preferences = Column(Text)
     diet_goals = Column(Text)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
@@ -58,7 +120,8 @@ class Profile(Base):
     user = relationship('User', back_populates='profile')
 
     def to_dict(self):
-        import json
+        created = self.created_at
+        updated = self.updated_at
         return {
             "id": self.id,
             "userId": self.user_id,
@@ -72,21 +135,21 @@ class Profile(Base):
             "bio": self.bio,
             "height_cm": self.height_cm,
             "weight_kg": self.weight_kg,
-            "allergies": json.loads(self.allergies) if self.allergies else [],
+            "allergies": self.allergies if self.allergies else [],
             "food_preferences": self.food_preferences,
             "diet_goals": self.diet_goals,
-            "createdAt": self.created_at.isoformat() if self.created_at else None,
-            "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
+            "createdAt": created.isoformat() if created else None,
+            "updatedAt": updated.isoformat() if updated else None,
         }
 
 
 class MealPlan(Base):
     __tablename__ = 'meal_plans'
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     height_cm = Column(Integer)
     weight_kg = Column(Integer)
-    allergies = Column(Text)  # store as JSON string
+    allergies = Column(JSON)  # JSON array of allergen strings
     food_preferences = Column(Text)
     diet_goals = Column(Text)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
@@ -94,64 +157,76 @@ class MealPlan(Base):
 
     name = Column(String, nullable=False)
     description = Column(Text)
-    meals = Column(Text)  # JSON array of meals
+    meals = Column(JSON)  # JSON array of meals
     is_active = Column(Boolean, default=True)
+    # Set for plans produced by /api/meal-plans/generate so the listing
+    # query is an indexed equality instead of a LIKE scan on description.
+    is_ai_generated = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
 
+    # activate_meal_plan filters on (user_id, is_active) for its bulk
+    # UPDATE; the composite indexes turn those lookups into index-range
+    # scans (the second also covers the generated-plan listing's sort).
+    __table_args__ = (
+        Index('ix_mealplan_user_active', 'user_id', 'is_active'),
+        Index('ix_mealplan_user_generated', 'user_id', 'is_ai_generated', 'created_at'),
+    )
+
     def to_dict(self):
-        import json
-        try:
-            meals = json.loads(self.meals) if self.meals else []
-        except Exception:
-            meals = []
+        created = self.created_at
+        updated = self.updated_at
         return {
             "id": self.id,
             "userId": self.user_id,
             "name": self.name,
             "description": self.description,
-            "meals": meals,
+            "meals": self.meals if self.meals else [],
             "isActive": self.is_active,
-            "createdAt": self.created_at.isoformat() if self.created_at else None,
-            "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
+            "createdAt": created.isoformat() if created else None,
+            "updatedAt": updated.isoformat() if updated else None,
         }
 
 
 class GroceryList(Base):
     __tablename__ = 'grocery_lists'
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
-    meal_plan_id = Column(Integer, ForeignKey('meal_plans.id'), nullable=True)
-    items = Column(Text)  # JSON array of items
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
+    meal_plan_id = Column(Integer, ForeignKey('meal_plans.id'), nullable=True, index=True)
+    items = Column(JSON)  # JSON array of items
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
     user = relationship('User')
     meal_plan = relationship('MealPlan')
 
+    # The per-meal-plan grocery lookup filters on both columns at once.
+    __table_args__ = (Index('ix_grocery_user_mealplan', 'user_id', 'meal_plan_id'),)
+
     def to_dict(self):
-        import json
-        try:
-            items = json.loads(self.items) if self.items else []
-        except Exception:
-            items = []
+        created = self.created_at
+        updated = self.updated_at
         return {
             "id": self.id,
             "userId": self.user_id,
             "mealPlanId": self.meal_plan_id,
-            "items": items,
-            "createdAt": self.created_at.isoformat() if self.created_at else None,
-            "updatedAt": self.updated_at.isoformat() if self.updated_at else None,
+            "items": self.items if self.items else [],
+            "createdAt": created.isoformat() if created else None,
+            "updatedAt": updated.isoformat() if updated else None,
         }
 
 
 class ChatMessage(Base):
     __tablename__ = 'chat_messages'
     id = Column(Integer, primary_key=True)
-    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
     message = Column(Text, nullable=False)
     response = Column(Text)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     user = relationship('User')
 
+    # Chat history is always read per-user ordered by time; the composite
+    # index covers that query without a separate sort.
+    __table_args__ = (Index('ix_chat_user_created', 'user_id', 'created_at'),)
+
     def to_dict(self):
         return {
             "id": self.id,
@@ -164,6 +239,44 @@ class ChatMessage(Base):
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so columns and indexes
+    # added after a table first shipped must be applied explicitly for
+    # existing DBs. Index.create is idempotent with checkfirst; the ALTER
+    # is guarded by a pragma check and backfills rows written before the
+    # flag existed (their description carries the old marker).
+    with engine.connect() as conn:
+        cols = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(meal_plans)")}
+        if cols and 'is_ai_generated' not in cols:
+            conn.exec_driver_sql(
+                "ALTER TABLE meal_plans ADD COLUMN is_ai_generated BOOLEAN DEFAULT 0"
+            )
+            conn.exec_driver_sql(
+                "UPDATE meal_plans SET is_ai_generated = 1 "
+                "WHERE description LIKE '%AI-generated%'"
+            )
+        for table in Base.metadata.tables.values():
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+        conn.commit()
+
+
+def _serialize_default(obj):
+    """orjson fallback: model instances serialize through their to_dict."""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+def serialize(obj) -> bytes:
+    """
+    Encode a response payload straight to JSON bytes with orjson.
+
+    Handles datetimes and dataclasses natively in C and falls back to
+    to_dict() for the ORM models, so list endpoints can skip the
+    per-row dict building plus the stdlib encode pass that jsonify does.
+    """
+    return orjson.dumps(obj, default=_serialize_default)
 
 
 class ValidationError(Exception):
@@ -174,7 +287,7 @@ class ValidationError(Exception):
         super().__init__(self.message)
 
 
-@dataclass
+@dataclass(slots=True)
 class UserInput:
     """Validated user input from frontend."""
     height_cm: int
@@ -232,7 +345,7 @@ class UserInput:
         
         # Validate no special characters in allergies
         for allergy in allergies:
-            if not re.match(r"^[a-z0-9\s\-]+$", allergy):
+            if not _ALLERGY_RE.match(allergy):
                 raise ValidationError(
                     f"Invalid allergy '{allergy}': only alphanumeric, spaces, and hyphens allowed",
                     "allergies"
@@ -263,7 +376,7 @@ class UserInput:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class UserMetrics:
     """Calculated health metrics for the user."""
     height_cm: int
@@ -273,58 +386,67 @@ class UserMetrics:
     macro_targets: Dict[str, int]
     
     @staticmethod
-    def calculate(user_input: UserInput) -> "UserMetrics":
+    @lru_cache(maxsize=8192)
+    def _derive(height_cm: int, weight_kg: int, diet_goals: str) -> tuple:
         """
-        Calculate user metrics from input data.
-        
-        Args:
-            user_input: Validated user input
-            
-        Returns:
-            UserMetrics with calculated values
+        Pure metric derivation, memoized on its scalar inputs.
+
+        Repeat users with the same height/weight/goals hit the cache
+        instead of redoing the arithmetic. Returns an immutable tuple
+        (bmi, tdee, protein_g, carbs_g, fats_g) so cached values cannot
+        be mutated by callers.
         """
-        height_m = user_input.height_cm / 100
-        bmi = user_input.weight_kg / (height_m ** 2)
-        
+        height_m = height_cm / 100
+        bmi = weight_kg / (height_m ** 2)
+
         # Estimate BMR using Mifflin-St Jeor equation
         # Assumes average person (approximation)
         # More accurate with age/gender, but using conservative estimate
-        bmr = 10 * user_input.weight_kg + 6.25 * user_input.height_cm - 5
-        
+        bmr = 10 * weight_kg + 6.25 * height_cm - 5
+
         # Activity factor: assuming moderate activity (1.5x)
         # Can be adjusted based on diet_goals
         activity_factor = 1.5
         tdee = int(bmr * activity_factor)
-        
-        # Adjust macro targets based on diet goals
-        if "weight loss" in user_input.diet_goals.lower():
-            # High protein for weight loss: 30% protein, 40% carbs, 30% fats
-            macro_targets = {
-                "protein_g": int((tdee * 0.30) / 4),
-                "carbs_g": int((tdee * 0.40) / 4),
-                "fats_g": int((tdee * 0.30) / 9)
-            }
-        elif "muscle" in user_input.diet_goals.lower() or "gain" in user_input.diet_goals.lower():
-            # Muscle gain: 35% protein, 45% carbs, 20% fats
-            macro_targets = {
-                "protein_g": int((tdee * 0.35) / 4),
-                "carbs_g": int((tdee * 0.45) / 4),
-                "fats_g": int((tdee * 0.20) / 9)
-            }
-        else:
-            # Balanced: 30% protein, 40% carbs, 30% fats
-            macro_targets = {
-                "protein_g": int((tdee * 0.30) / 4),
-                "carbs_g": int((tdee * 0.40) / 4),
-                "fats_g": int((tdee * 0.30) / 9)
-            }
-        
+
+        # Adjust macro targets based on diet goals: lowercase the goals once,
+        # pick the first matching profile, and build a single macro dict from
+        # the table instead of branching into three near-identical literals.
+        goals = diet_goals.lower()
+        profile = next((tag for keyword, tag in _GOAL_KEYWORDS if keyword in goals), "balanced")
+        protein_pct, carbs_pct, fats_pct = _MACRO_PROFILES[profile]
+        return (
+            round(bmi, 1),
+            tdee,
+            int((tdee * protein_pct) / 4),
+            int((tdee * carbs_pct) / 4),
+            int((tdee * fats_pct) / 9),
+        )
+
+    @staticmethod
+    def calculate(user_input: UserInput) -> "UserMetrics":
+        """
+        Calculate user metrics from input data.
+
+        Args:
+            user_input: Validated user input
+
+        Returns:
+            UserMetrics with calculated values
+        """
+        bmi, tdee, protein_g, carbs_g, fats_g = UserMetrics._derive(
+            user_input.height_cm, user_input.weight_kg, user_input.diet_goals
+        )
         return UserMetrics(
             height_cm=user_input.height_cm,
             weight_kg=user_input.weight_kg,
-            bmi=round(bmi, 1),
+            bmi=bmi,
             tdee_estimate=tdee,
-            macro_targets=macro_targets
+            macro_targets={
+                "protein_g": protein_g,
+                "carbs_g": carbs_g,
+                "fats_g": fats_g,
+            }
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -338,7 +460,7 @@ class UserMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RecipeNutrition:
     """Nutritional information for a recipe."""
     calories: int
@@ -367,20 +489,25 @@ class RecipeNutrition:
             RecipeNutrition object or None if data is incomplete
         """
         try:
-            # Spoonacular returns nutrients as array of objects
-            nutrients = {n["name"]: n["amount"] for n in nutrition_data.get("nutrients", [])}
-            
+            # Spoonacular returns 30+ nutrients; scan the array once for the
+            # four we keep instead of building a full name->amount dict.
+            wanted = {"Calories": 0.0, "Protein": 0.0, "Carbohydrates": 0.0, "Fat": 0.0}
+            for nutrient in nutrition_data.get("nutrients", ()):
+                name = nutrient.get("name")
+                if name in wanted:
+                    wanted[name] = nutrient.get("amount", 0.0)
+
             return RecipeNutrition(
-                calories=int(nutrients.get("Calories", 0)),
-                protein_g=float(nutrients.get("Protein", 0)),
-                carbs_g=float(nutrients.get("Carbohydrates", 0)),
-                fats_g=float(nutrients.get("Fat", 0))
+                calories=int(wanted["Calories"]),
+                protein_g=float(wanted["Protein"]),
+                carbs_g=float(wanted["Carbohydrates"]),
+                fats_g=float(wanted["Fat"])
             )
         except (KeyError, TypeError, ValueError):
             return None
 
 
-@dataclass
+@dataclass(slots=True)
 class RecipePricing:
     """Pricing information for a recipe."""
     cost_per_serving: float
@@ -419,7 +546,22 @@ class RecipePricing:
             return None
 
 
-@dataclass
+def _macro_score(protein, carbs, fats, protein_t, carbs_t, fats_t):
+    """Scalar macro-alignment kernel shared by Recipe and the batch scorer.
+
+    Takes six floats and touches no dicts or attributes, so the scoring
+    loop over a ranked batch runs straight arithmetic. Returns the 0-100
+    score rounded to one decimal.
+    """
+    avg_dev = (
+        abs(protein - protein_t) / (protein_t if protein_t > 1 else 1)
+        + abs(carbs - carbs_t) / (carbs_t if carbs_t > 1 else 1)
+        + abs(fats - fats_t) / (fats_t if fats_t > 1 else 1)
+    ) / 3
+    return round(max(0, 100 - (avg_dev * 100)), 1)
+
+
+@dataclass(slots=True)
 class Recipe:
     """Complete recipe with all enriched data."""
     id: int
@@ -430,19 +572,40 @@ class Recipe:
     macronutrients: Optional[RecipeNutrition] = None
     pricing: Optional[RecipePricing] = None
     macro_alignment_score: float = 0.0
-    
+    # Lazily built by to_dict; the same Recipe often appears in repeated
+    # result pages, so serialize it once per object.
+    _cached_dict: Optional[Dict[str, Any]] = field(
+        default=None, repr=False, compare=False
+    )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON response."""
-        return {
+        if self._cached_dict is not None:
+            return self._cached_dict
+        # Inline the nested to_dict calls: one dict literal per recipe
+        # instead of three when serializing a full result page.
+        nutrition = self.macronutrients
+        pricing = self.pricing
+        self._cached_dict = {
             "id": self.id,
             "title": self.title,
             "image": self.image,
             "used_ingredients": self.used_ingredients,
             "missed_ingredients": self.missed_ingredients,
-            "macronutrients": self.macronutrients.to_dict() if self.macronutrients else None,
-            "pricing": self.pricing.to_dict() if self.pricing else None
+            "macronutrients": None if nutrition is None else {
+                "calories": nutrition.calories,
+                "protein_g": round(nutrition.protein_g, 1),
+                "carbs_g": round(nutrition.carbs_g, 1),
+                "fats_g": round(nutrition.fats_g, 1)
+            },
+            "pricing": None if pricing is None else {
+                "cost_per_serving": round(pricing.cost_per_serving, 2),
+                "currency": pricing.currency,
+                "servings": pricing.servings
+            }
         }
-    
+        return self._cached_dict
+
     def calculate_macro_alignment(self, target_macros: Dict[str, int]) -> float:
         """
         Calculate how well recipe macros align with user targets.
@@ -457,17 +620,13 @@ class Recipe:
         if not self.macronutrients:
             return 0.0
         
-        # Calculate deviation from targets
-        protein_dev = abs(self.macronutrients.protein_g - target_macros.get("protein_g", 0)) / max(target_macros.get("protein_g", 1), 1)
-        carbs_dev = abs(self.macronutrients.carbs_g - target_macros.get("carbs_g", 0)) / max(target_macros.get("carbs_g", 1), 1)
-        fats_dev = abs(self.macronutrients.fats_g - target_macros.get("fats_g", 0)) / max(target_macros.get("fats_g", 1), 1)
-        
-        # Average deviation (0 = perfect, 1+ = poor)
-        avg_dev = (protein_dev + carbs_dev + fats_dev) / 3
-        
-        # Convert to 0-100 score
-        score = max(0, 100 - (avg_dev * 100))
-        return round(score, 1)
+        nutrition = self.macronutrients
+        return _macro_score(
+            nutrition.protein_g, nutrition.carbs_g, nutrition.fats_g,
+            target_macros.get("protein_g", 0),
+            target_macros.get("carbs_g", 0),
+            target_macros.get("fats_g", 0),
+        )
 
 
 class APIError(Exception):
@@ -483,7 +642,7 @@ class ExternalAPIError(APIError):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class Meal:
     """Represents a single meal with nutritional information."""
     name: str
@@ -493,7 +652,19 @@ class Meal:
     carbs: Optional[float] = None
     fat: Optional[float] = None
     recipe_id: Optional[int] = None
-    
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Meal':
+        """Build a Meal from a Gemini meal dict (missing keys become None)."""
+        return cls(
+            name=data["name"],
+            description=data.get("description"),
+            calories=data.get("calories"),
+            protein=data.get("protein"),
+            carbs=data.get("carbs"),
+            fat=data.get("fat")
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "name": self.name,
@@ -506,7 +677,7 @@ class Meal:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class DayMeals:
     """Represents meals for a single day."""
     day: str
@@ -527,7 +698,7 @@ class DayMeals:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class GeneratedMealPlan:
     """Represents a complete generated meal plan."""
     id: str
@@ -3,26 +3,184 @@ Service layer for external API calls and business logic.
 Handles Gemini, Spoonacular, and calculations.
 """
 
+import heapq
 import logging
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
+import orjson
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from google import genai
 from app_models import (
     UserInput, UserMetrics, Recipe, RecipeNutrition, RecipePricing,
-    ValidationError, ExternalAPIError, GeneratedMealPlan, DayMeals, Meal
+    ValidationError, ExternalAPIError, GeneratedMealPlan, DayMeals, Meal,
+    _macro_score,
 )
 
 logger = logging.getLogger(__name__)
 
+# One genai.Client per process: the client owns HTTP transport and auth
+# state, so constructing it per service instance duplicates both.
+_GENAI_CLIENT: Optional[genai.Client] = None
+
+# Static prompt template for ingredient extraction; only the three user
+# fields vary per call, so the template is built once at import.
+_INGREDIENT_PROMPT = """You are a recipe ingredient extractor. The user has provided:
+
+Dietary Goals: {diet_goals}
+Food Preferences: {food_preferences}
+ALLERGIES TO EXCLUDE: {allergy_str}
+
+Your task:
+1. Extract ingredients suitable for the stated goals and preferences
+2. ABSOLUTELY DO NOT include any of the allergenic ingredients
+3. Return ONLY a comma-separated list of ingredients
+4. Example format: "chicken,broccoli,olive oil,garlic"
+
+CRITICAL: Do not include {allergy_str} in any form. Return ONLY the ingredient list, nothing else."""
+
+
+def _get_genai_client(api_key: str) -> genai.Client:
+    global _GENAI_CLIENT
+    if _GENAI_CLIENT is None:
+        _GENAI_CLIENT = genai.Client(api_key=api_key)
+    return _GENAI_CLIENT
+
+
+class CircuitBreaker:
+    """
+    Minimal circuit breaker for the external API clients.
+
+    Opens after `fail_max` consecutive transport failures so a degraded
+    upstream fails fast (sub-ms) instead of tying workers up in timeouts;
+    after `reset_timeout` seconds a trial call is let through and a
+    success closes the circuit again.
+    """
+
+    def __init__(self, name: str, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def call(self, fn, *args, **kwargs):
+        with self._lock:
+            if self._opened_at is not None:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise ExternalAPIError(f"{self.name} temporarily unavailable (circuit open)")
+                # Half-open: let this call through as a trial.
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self._failures += 1
+                if self._failures >= self.fail_max:
+                    if self._opened_at is None:
+                        logger.error("%s circuit opened after %d consecutive failures", self.name, self._failures)
+                    self._opened_at = time.monotonic()
+            raise
+
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+        return result
+
+
+def score_recipe_batch(recipes: List[Recipe], macro_targets: Dict[str, int]) -> None:
+    """
+    Assign `macro_alignment_score` to every recipe in one pass.
+
+    Hoists the target extraction out of the per-recipe loop so scoring a
+    batch does constant work per recipe instead of re-reading the target
+    dict for each one. Mirrors Recipe.calculate_macro_alignment.
+
+    Args:
+        recipes: Recipes to score (mutated in place)
+        macro_targets: Target macro amounts {protein_g, carbs_g, fats_g}
+    """
+    protein_t = macro_targets.get("protein_g", 0)
+    carbs_t = macro_targets.get("carbs_g", 0)
+    fats_t = macro_targets.get("fats_g", 0)
+
+    for recipe in recipes:
+        nutrition = recipe.macronutrients
+        if not nutrition:
+            recipe.macro_alignment_score = 0.0
+            continue
+        recipe.macro_alignment_score = _macro_score(
+            nutrition.protein_g, nutrition.carbs_g, nutrition.fats_g,
+            protein_t, carbs_t, fats_t,
+        )
+
 
 class GeminiService:
     """Handle all Gemini AI API calls."""
     
     def __init__(self, api_key: str):
         """Initialize Gemini client."""
-        self.client = genai.Client(api_key=api_key)
+        self.client = _get_genai_client(api_key)
         self.model = "gemini-2.0-flash"
-    
+        # The ingredient parse is a pure function of its normalized inputs
+        # and is the slowest step in the pipeline, so repeat requests should
+        # hit a cache instead of paying the LLM round-trip again.
+        self._parse_cache = TTLCache(maxsize=4096, ttl=86400)
+        # TTLCache is not thread-safe; gthread workers hit this service
+        # from several request threads at once.
+        self._cache_lock = threading.Lock()
+        self._breaker = CircuitBreaker("Gemini")
+
+    MAX_ATTEMPTS = 3
+
+    def generate_content(self, prompt: str):
+        """
+        Call Gemini with retries on transient failures.
+
+        Retries use exponential backoff with jitter so a brief upstream
+        blip does not surface as a user-facing error, while repeated
+        failures still fail within a few seconds.
+        """
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                return self._breaker.call(
+                    self.client.models.generate_content, model=self.model, contents=prompt
+                )
+            except ExternalAPIError:
+                # Circuit open: retrying immediately cannot help.
+                raise
+            except Exception as e:
+                if attempt == self.MAX_ATTEMPTS:
+                    raise
+                delay = min(0.5 * (2 ** (attempt - 1)), 4.0) * (0.5 + random.random())
+                logger.warning(
+                    f"Gemini call failed (attempt {attempt}/{self.MAX_ATTEMPTS}), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                time.sleep(delay)
+
+    @staticmethod
+    def _parse_cache_key(
+        food_preferences: str,
+        diet_goals: str,
+        allergies: List[str]
+    ) -> tuple:
+        """Normalized, allergy-order-independent cache key."""
+        return (
+            food_preferences.strip().lower(),
+            diet_goals.strip().lower(),
+            tuple(sorted(a.lower() for a in allergies)),
+        )
+
     def parse_ingredients_with_constraints(
         self,
         food_preferences: str,
@@ -43,36 +201,35 @@ class GeminiService:
         Raises:
             ExternalAPIError: If Gemini API call fails
         """
-        try:
-            # Build allergy constraint string
-            allergy_str = ", ".join(allergies) if allergies else "none"
-            
-            prompt = f"""You are a recipe ingredient extractor. The user has provided:
-            
-Dietary Goals: {diet_goals}
-Food Preferences: {food_preferences}
-ALLERGIES TO EXCLUDE: {allergy_str}
+        cache_key = self._parse_cache_key(food_preferences, diet_goals, allergies)
+        with self._cache_lock:
+            cached = self._parse_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Gemini parse cache hit")
+            return cached
 
-Your task:
-1. Extract ingredients suitable for the stated goals and preferences
-2. ABSOLUTELY DO NOT include any of the allergenic ingredients
-3. Return ONLY a comma-separated list of ingredients
-4. Example format: "chicken,broccoli,olive oil,garlic"
+        try:
+            prompt = _INGREDIENT_PROMPT.format(
+                diet_goals=diet_goals,
+                food_preferences=food_preferences,
+                allergy_str=", ".join(allergies) if allergies else "none",
+            )
 
-CRITICAL: Do not include {allergy_str} in any form. Return ONLY the ingredient list, nothing else."""
-            
-            chat = self.client.chats.create(model=self.model)
-            response = chat.send_message(prompt)
+            # Single-shot prompt: generate_content is stateless and skips the
+            # chat-session setup that chats.create pays per call.
+            response = self.generate_content(prompt)
             ingredients_str = response.text.strip()
             
             if not ingredients_str or ingredients_str.lower() in ["none", "no ingredients"]:
                 raise ExternalAPIError("Gemini could not extract meaningful ingredients from the provided input")
             
-            logger.info(f"Gemini extracted ingredients: {ingredients_str[:100]}...")
+            logger.info("Gemini extracted ingredients: %.100s...", ingredients_str)
+            with self._cache_lock:
+                self._parse_cache[cache_key] = ingredients_str
             return ingredients_str
             
         except Exception as e:
-            logger.error(f"Gemini API error: {str(e)}")
+            logger.error("Gemini API error: %s", e)
             raise ExternalAPIError(f"Gemini API error: {str(e)}")
 
 
@@ -80,12 +237,69 @@ class SpoonacularService:
     """Handle all Spoonacular API calls with caching."""
     
     BASE_URL = "https://api.spoonacular.com"
-    REQUEST_TIMEOUT = 10
+    # Connect/read budgets: a dead DNS or unreachable host should fail in
+    # ~2s instead of burning a worker for the full read budget, and each
+    # endpoint's read timeout sits a bit above its typical latency.
+    CONNECT_TIMEOUT = 2
+    READ_TIMEOUTS = {
+        "findByIngredients": 6,
+        "information": 8,
+        "informationBulk": 8,
+        "priceBreakdown": 4,
+    }
     
     def __init__(self, api_key: str):
         """Initialize Spoonacular service."""
         self.api_key = api_key
-        self._recipe_cache = {}  # Simple in-memory cache
+        # Bounded caches: recipe info and pricing change slowly, so an hour
+        # of TTL is safe, and the maxsize keeps long-running processes from
+        # accumulating every recipe ever requested.
+        self._recipe_cache = TTLCache(maxsize=1024, ttl=3600)
+        self._price_cache = TTLCache(maxsize=1024, ttl=3600)
+        # Negative cache: many recipes simply have no price data (404), and
+        # re-fetching to rediscover that wastes a full round-trip each time.
+        self._price_404 = TTLCache(maxsize=4096, ttl=3600)
+        # Search coalescing: under load, concurrent requests often ask for
+        # the same ingredient set. A short cache plus an in-flight registry
+        # lets duplicates share one upstream call instead of each paying it.
+        self._search_cache = TTLCache(maxsize=256, ttl=300)
+        self._search_inflight: Dict[tuple, threading.Event] = {}
+        # TTLCache is not thread-safe and enrichment fans out across a
+        # thread pool, so all cache reads/writes go through this lock.
+        self._cache_lock = threading.RLock()
+        # Persistent session: keep-alive connections avoid a fresh TCP+TLS
+        # handshake for every one of the 2×N calls an enrichment pass makes.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+            ),
+        ))
+        # The API key is constant per service; attach it once instead of
+        # rebuilding it into every params dict.
+        self._session.params = {"apiKey": self.api_key}
+        # Be explicit about compression: recipe-info bodies are 30-200KB of
+        # JSON that compresses 5-10x, and we don't want an intermediate
+        # proxy downgrading us to identity encoding.
+        self._session.headers.update({
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": "literate-spoon/1.0",
+        })
+        self._breaker = CircuitBreaker("Spoonacular")
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """Session GET routed through the circuit breaker.
+
+        Only transport-level failures (timeouts, connection errors) count
+        toward opening the circuit; HTTP error statuses are judged by the
+        callers via raise_for_status.
+        """
+        return self._breaker.call(self._session.get, url, **kwargs)
     
     def search_recipes_by_ingredients(
         self,
@@ -107,25 +321,52 @@ class SpoonacularService:
         Raises:
             ExternalAPIError: If API call fails
         """
+        search_key = (ingredients, number, ranking)
+
+        # Single-flight: if another thread is already fetching this exact
+        # search, wait for it and reuse its result rather than issuing a
+        # duplicate upstream call.
+        while True:
+            with self._cache_lock:
+                cached = self._search_cache.get(search_key)
+                if cached is not None:
+                    return cached
+                pending = self._search_inflight.get(search_key)
+                if pending is None:
+                    self._search_inflight[search_key] = threading.Event()
+                    break
+            pending.wait(timeout=self.READ_TIMEOUTS["findByIngredients"])
+            # Loop back: either the leader cached a result, or it failed and
+            # this thread becomes the new leader.
+
         try:
             url = f"{self.BASE_URL}/recipes/findByIngredients"
             params = {
                 "ingredients": ingredients,
                 "number": number,
                 "ranking": ranking,
-                "apiKey": self.api_key
             }
-            
-            response = requests.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
+
+            response = self._get(
+                url, params=params,
+                timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUTS["findByIngredients"])
+            )
             response.raise_for_status()
-            
-            recipes = response.json()
-            logger.info(f"Spoonacular found {len(recipes)} recipes")
+
+            recipes = orjson.loads(response.content)
+            logger.info("Spoonacular found %d recipes", len(recipes))
+            with self._cache_lock:
+                self._search_cache[search_key] = recipes
             return recipes
-            
+
         except requests.exceptions.RequestException as e:
-            logger.error(f"Spoonacular search error: {str(e)}")
+            logger.error("Spoonacular search error: %s", e)
             raise ExternalAPIError(f"Spoonacular search failed: {str(e)}")
+        finally:
+            with self._cache_lock:
+                event = self._search_inflight.pop(search_key, None)
+            if event is not None:
+                event.set()
     
     def get_recipe_information(self, recipe_id: int) -> Dict[str, Any]:
         """
@@ -142,25 +383,74 @@ class SpoonacularService:
         """
         try:
             # Check cache first
-            if recipe_id in self._recipe_cache:
-                return self._recipe_cache[recipe_id]
-            
+            with self._cache_lock:
+                cached = self._recipe_cache.get(recipe_id)
+            if cached is not None:
+                return cached
+
             url = f"{self.BASE_URL}/recipes/{recipe_id}/information"
-            params = {
-                "includeNutrition": True,
-                "apiKey": self.api_key
-            }
-            
-            response = requests.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
+            params = {"includeNutrition": True}
+
+            response = self._get(
+                url, params=params,
+                timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUTS["information"])
+            )
             response.raise_for_status()
             
-            info = response.json()
-            self._recipe_cache[recipe_id] = info
+            info = orjson.loads(response.content)
+            with self._cache_lock:
+                self._recipe_cache[recipe_id] = info
             return info
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Spoonacular info error for recipe {recipe_id}: {str(e)}")
+            logger.error("Spoonacular info error for recipe %s: %s", recipe_id, e)
             raise ExternalAPIError(f"Failed to fetch recipe details: {str(e)}")
+
+    def get_recipe_information_bulk(self, recipe_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Get detailed information for many recipes in one HTTP call.
+
+        Uses Spoonacular's /recipes/informationBulk endpoint (up to 100 IDs
+        per call) and populates the per-recipe cache, so subsequent
+        get_recipe_information calls for these IDs are cache hits. IDs
+        already cached are skipped.
+
+        Args:
+            recipe_ids: Spoonacular recipe IDs
+
+        Returns:
+            List of recipe information dicts for the uncached IDs
+        """
+        with self._cache_lock:
+            missing = [rid for rid in recipe_ids if rid not in self._recipe_cache]
+        if not missing:
+            return []
+
+        try:
+            url = f"{self.BASE_URL}/recipes/informationBulk"
+            params = {
+                "ids": ",".join(str(rid) for rid in missing),
+                "includeNutrition": True,
+            }
+
+            response = self._get(
+                url, params=params,
+                timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUTS["informationBulk"])
+            )
+            response.raise_for_status()
+
+            infos = orjson.loads(response.content)
+            with self._cache_lock:
+                for info in infos:
+                    if "id" in info:
+                        self._recipe_cache[info["id"]] = info
+            return infos
+
+        except requests.exceptions.RequestException as e:
+            # Bulk fetch is an optimization; callers fall back to the
+            # per-recipe path, which raises on its own failures.
+            logger.warning("Spoonacular bulk info fetch failed, falling back to per-recipe calls: %s", e)
+            return []
     
     def get_recipe_price_breakdown(self, recipe_id: int) -> Dict[str, Any]:
         """
@@ -176,13 +466,24 @@ class SpoonacularService:
             ExternalAPIError: If API call fails
         """
         try:
+            with self._cache_lock:
+                cached = self._price_cache.get(recipe_id)
+                if cached is None and recipe_id in self._price_404:
+                    cached = {}
+            if cached is not None:
+                return cached
+
             url = f"{self.BASE_URL}/recipes/{recipe_id}/priceBreakdown"
-            params = {"apiKey": self.api_key}
 
-            response = requests.get(url, params=params, timeout=self.REQUEST_TIMEOUT)
+            response = self._get(
+                url, timeout=(self.CONNECT_TIMEOUT, self.READ_TIMEOUTS["priceBreakdown"])
+            )
             response.raise_for_status()
 
-            return response.json()
+            price_data = orjson.loads(response.content)
+            with self._cache_lock:
+                self._price_cache[recipe_id] = price_data
+            return price_data
 
         except requests.exceptions.HTTPError as e:
             # Some recipes do not have price breakdown data (404). Treat as optional and return None.
@@ -191,55 +492,86 @@ class SpoonacularService:
                 status = e.response.status_code
 
             if status == 404:
-                logger.info(f"Spoonacular price data not found for recipe {recipe_id} (404). Skipping pricing for this recipe.")
+                logger.info("Spoonacular price data not found for recipe %s (404). Skipping pricing for this recipe.", recipe_id)
+                with self._cache_lock:
+                    self._price_404[recipe_id] = True
                 return {}
             else:
-                logger.warning(f"Spoonacular price HTTP error for recipe {recipe_id}: {str(e)}")
+                logger.warning("Spoonacular price HTTP error for recipe %s: %s", recipe_id, e)
                 return {}
 
         except requests.exceptions.RequestException as e:
-            logger.error(f"Spoonacular price error for recipe {recipe_id}: {str(e)}")
+            logger.error("Spoonacular price error for recipe %s: %s", recipe_id, e)
             # Price is optional - log but don't raise
             return {}
     
+    @staticmethod
+    def compile_allergen_pattern(allergies: List[str]) -> Optional[re.Pattern]:
+        """
+        Build a single alternation pattern matching any allergen.
+
+        One compiled pattern scans each ingredient in a single C-level pass
+        instead of an O(ingredients x allergies) Python loop. Returns None
+        when there are no allergies to check.
+        """
+        if not allergies:
+            return None
+        return re.compile("|".join(re.escape(a.lower()) for a in allergies))
+
     def enrich_recipe(
         self,
         basic_recipe: Dict[str, Any],
-        allergies: List[str]
+        allergies: List[str],
+        allergen_pattern: Optional[re.Pattern] = None
     ) -> Optional[Recipe]:
         """
         Enrich a basic recipe with nutrition and pricing.
         Also filter out recipes containing allergens.
-        
+
         Args:
             basic_recipe: Recipe from search results
             allergies: List of allergens to check
-            
+            allergen_pattern: Precompiled pattern from compile_allergen_pattern;
+                built from `allergies` when not supplied
+
         Returns:
             Enriched Recipe object or None if contains allergen
         """
         try:
             recipe_id = basic_recipe.get("id")
-            
+
+            if allergen_pattern is None:
+                allergen_pattern = self.compile_allergen_pattern(allergies)
+
+            # Cheap pre-filter: the search result already names the used and
+            # missed ingredients, so an obvious allergen hit there rejects
+            # the recipe before we spend the full-info round-trip on it.
+            if allergen_pattern:
+                for ingredient in (
+                    basic_recipe.get("usedIngredients", [])
+                    + basic_recipe.get("missedIngredients", [])
+                ):
+                    if allergen_pattern.search(ingredient.get("name", "").lower()):
+                        logger.info("Filtering out recipe %s: search result contains an excluded allergen", recipe_id)
+                        return None
+
             # Get full recipe info (includes nutrition)
             try:
                 full_info = self.get_recipe_information(recipe_id)
             except ExternalAPIError as e:
-                logger.warning(f"Could not fetch full info for {recipe_id}: {e}")
+                logger.warning("Could not fetch full info for %s: %s", recipe_id, e)
                 full_info = basic_recipe
-            
+
             # Check for allergens in all ingredients
             all_ingredients = []
             if "extendedIngredients" in full_info:
                 for ingredient in full_info["extendedIngredients"]:
                     ingredient_name = ingredient.get("original", "").lower()
                     all_ingredients.append(ingredient_name)
-                    
-                    # Check if any allergen is in this ingredient
-                    for allergen in allergies:
-                        if allergen.lower() in ingredient_name:
-                            logger.info(f"Filtering out recipe {recipe_id}: contains allergen '{allergen}'")
-                            return None
+
+                    if allergen_pattern and allergen_pattern.search(ingredient_name):
+                        logger.info("Filtering out recipe %s: contains an excluded allergen", recipe_id)
+                        return None
             
             # Extract nutrition
             nutrition = None
@@ -269,7 +601,7 @@ class SpoonacularService:
             return recipe
             
         except Exception as e:
-            logger.error(f"Error enriching recipe {basic_recipe.get('id')}: {str(e)}")
+            logger.error("Error enriching recipe %s: %s", basic_recipe.get('id'), e)
             return None
 
 
@@ -316,17 +648,21 @@ class RecipeService:
         Raises:
             ExternalAPIError: If external API calls fail
         """
-        # Calculate user metrics
-        metrics = UserMetricsService.calculate_metrics(user_input)
-        logger.info(f"Calculated metrics - BMI: {metrics.bmi}, TDEE: {metrics.tdee_estimate}")
-        
-        # Step 1: Extract ingredients with Gemini
-        parsed_ingredients = self.gemini.parse_ingredients_with_constraints(
-            user_input.food_preferences,
-            user_input.diet_goals,
-            user_input.allergies
-        )
-        logger.info(f"Parsed ingredients: {parsed_ingredients}")
+        # Step 1: Extract ingredients with Gemini, computing the local
+        # metrics while the LLM round-trip is in flight — the two are
+        # independent, so the BMI/TDEE math rides for free under the
+        # Gemini latency.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            ingredients_future = executor.submit(
+                self.gemini.parse_ingredients_with_constraints,
+                user_input.food_preferences,
+                user_input.diet_goals,
+                user_input.allergies,
+            )
+            metrics = UserMetricsService.calculate_metrics(user_input)
+            logger.info("Calculated metrics - BMI: %s, TDEE: %s", metrics.bmi, metrics.tdee_estimate)
+            parsed_ingredients = ingredients_future.result()
+        logger.info("Parsed ingredients: %s", parsed_ingredients)
         
         # Step 2: Search recipes
         basic_recipes = self.spoonacular.search_recipes_by_ingredients(
@@ -338,31 +674,57 @@ class RecipeService:
             logger.warning("No recipes found from Spoonacular")
             return parsed_ingredients, [], metrics
         
-        # Step 3: Enrich recipes and filter for allergens
-        enriched_recipes = []
-        for basic_recipe in basic_recipes:
-            recipe = self.spoonacular.enrich_recipe(basic_recipe, user_input.allergies)
-            if recipe:
-                enriched_recipes.append(recipe)
+        # The allergen pattern is compiled once here and shared by every
+        # worker; compiling it before the bulk prefetch lets the cheap
+        # pre-filter in enrich_recipe drop doomed candidates without paying
+        # for their detail fetch.
+        allergen_pattern = self.spoonacular.compile_allergen_pattern(user_input.allergies)
+        if allergen_pattern:
+            basic_recipes = [
+                r for r in basic_recipes
+                if not any(
+                    allergen_pattern.search(i.get("name", "").lower())
+                    for i in r.get("usedIngredients", []) + r.get("missedIngredients", [])
+                )
+            ]
+
+        # Prefetch detailed info for every surviving candidate in one bulk
+        # call so the per-recipe lookups inside enrich_recipe are cache hits.
+        self.spoonacular.get_recipe_information_bulk(
+            [r["id"] for r in basic_recipes if "id" in r]
+        )
+
+        # Step 3: Enrich recipes and filter for allergens. Each enrichment is
+        # an independent pair of blocking HTTP calls, so fan out across a
+        # thread pool instead of paying 2×N round-trips serially. The pooled
+        # session above is sized to handle the concurrent connections.
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            enriched_recipes = [
+                recipe
+                for recipe in executor.map(
+                    lambda basic: self.spoonacular.enrich_recipe(
+                        basic, user_input.allergies, allergen_pattern
+                    ),
+                    basic_recipes,
+                )
+                if recipe
+            ]
         
-        logger.info(f"Enriched {len(enriched_recipes)} recipes (after allergen filtering)")
+        logger.info("Enriched %d recipes (after allergen filtering)", len(enriched_recipes))
         
         # Step 4: Calculate macro alignment and sort
-        for recipe in enriched_recipes:
-            recipe.macro_alignment_score = recipe.calculate_macro_alignment(metrics.macro_targets)
+        score_recipe_batch(enriched_recipes, metrics.macro_targets)
         
-        # Sort by: (1) macro alignment score, (2) cost (low to high)
-        sorted_recipes = sorted(
-            enriched_recipes,
-            key=lambda r: (
-                -r.macro_alignment_score,  # Higher score first
-                r.pricing.cost_per_serving if r.pricing else float('inf')  # Lower cost first
-            )
-        )
-        
-        # Return top N
-        final_recipes = sorted_recipes[:limit]
-        logger.info(f"Returning {len(final_recipes)} recipes")
+        # Rank by: (1) macro alignment score, (2) cost (low to high).
+        # Keys are computed once per recipe and nsmallest keeps only the top
+        # `limit` candidates (O(N log k) instead of a full sort).
+        keyed = [
+            ((-r.macro_alignment_score,
+              r.pricing.cost_per_serving if r.pricing else float('inf')), r)
+            for r in enriched_recipes
+        ]
+        final_recipes = [r for _, r in heapq.nsmallest(limit, keyed, key=lambda pair: pair[0])]
+        logger.info("Returning %d recipes", len(final_recipes))
         
         return parsed_ingredients, final_recipes, metrics
 
@@ -399,10 +761,6 @@ class MealPlanService:
             ExternalAPIError: If API calls fail
         """
         try:
-            import json
-            from datetime import datetime, timedelta
-            import uuid
-            
             # Create the Gemini prompt for meal plan generation
             allergy_str = ", ".join(allergies) if allergies else "none"
             daily_budget = budget / 7  # Distribute weekly budget across 7 days
@@ -469,19 +827,22 @@ Requirements:
 
 Generate the meal plan now:"""
 
-            # Get meal plan from Gemini
-            chat = self.gemini_service.client.chats.create(model=self.gemini_service.model)
-            response = chat.send_message(prompt)
+            # Get meal plan from Gemini. This is a stateless single-shot
+            # prompt, so go through generate_content directly instead of
+            # paying for a chat session that is thrown away after one message.
+            response = self.gemini_service.generate_content(prompt)
             
             # Parse the JSON response
             try:
-                meal_plan_data = json.loads(response.text.strip())
-            except json.JSONDecodeError:
-                # Try to extract JSON from the response if it's wrapped in text
-                import re
-                json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-                if json_match:
-                    meal_plan_data = json.loads(json_match.group())
+                meal_plan_data = orjson.loads(response.text.strip())
+            except orjson.JSONDecodeError:
+                # The model sometimes wraps the JSON in prose or a code
+                # fence; slice out the outermost braces with C-level
+                # str.find/rfind instead of a greedy DOTALL regex scan.
+                start = response.text.find("{")
+                end = response.text.rfind("}")
+                if start != -1 and end > start:
+                    meal_plan_data = orjson.loads(response.text[start:end + 1])
                 else:
                     raise ExternalAPIError("Gemini returned invalid JSON format")
             
@@ -490,63 +851,23 @@ Generate the meal plan now:"""
             total_weekly_calories = 0
             
             for day_data in meal_plan_data.get("days", []):
-                # Create meals
-                breakfast = Meal(
-                    name=day_data["breakfast"]["name"],
-                    description=day_data["breakfast"].get("description"),
-                    calories=day_data["breakfast"].get("calories"),
-                    protein=day_data["breakfast"].get("protein"),
-                    carbs=day_data["breakfast"].get("carbs"),
-                    fat=day_data["breakfast"].get("fat")
-                )
-                
-                lunch = Meal(
-                    name=day_data["lunch"]["name"],
-                    description=day_data["lunch"].get("description"),
-                    calories=day_data["lunch"].get("calories"),
-                    protein=day_data["lunch"].get("protein"),
-                    carbs=day_data["lunch"].get("carbs"),
-                    fat=day_data["lunch"].get("fat")
-                )
-                
-                dinner = Meal(
-                    name=day_data["dinner"]["name"],
-                    description=day_data["dinner"].get("description"),
-                    calories=day_data["dinner"].get("calories"),
-                    protein=day_data["dinner"].get("protein"),
-                    carbs=day_data["dinner"].get("carbs"),
-                    fat=day_data["dinner"].get("fat")
-                )
-                
-                # Handle snacks
-                snacks = []
-                if "snacks" in day_data and day_data["snacks"]:
-                    for snack_data in day_data["snacks"]:
-                        snack = Meal(
-                            name=snack_data["name"],
-                            description=snack_data.get("description"),
-                            calories=snack_data.get("calories"),
-                            protein=snack_data.get("protein"),
-                            carbs=snack_data.get("carbs"),
-                            fat=snack_data.get("fat")
-                        )
-                        snacks.append(snack)
-                
-                # Create day meals
-                day_meals = DayMeals(
+                breakfast = Meal.from_dict(day_data["breakfast"])
+                lunch = Meal.from_dict(day_data["lunch"])
+                dinner = Meal.from_dict(day_data["dinner"])
+                snacks = [Meal.from_dict(s) for s in day_data.get("snacks") or []]
+
+                days.append(DayMeals(
                     day=day_data["day"],
                     breakfast=breakfast,
                     lunch=lunch,
                     dinner=dinner,
                     snacks=snacks if snacks else None
+                ))
+
+                total_weekly_calories += sum(
+                    meal.calories or 0
+                    for meal in (breakfast, lunch, dinner, *snacks)
                 )
-                
-                days.append(day_meals)
-                
-                # Calculate daily calories
-                day_calories = (breakfast.calories or 0) + (lunch.calories or 0) + (dinner.calories or 0)
-                day_calories += sum(snack.calories or 0 for snack in snacks)
-                total_weekly_calories += day_calories
             
             # Create the final meal plan
             start_date = datetime.now()
@@ -563,9 +884,9 @@ Generate the meal plan now:"""
                 created_at=datetime.now().isoformat()
             )
             
-            logger.info(f"Generated meal plan with {len(days)} days, total calories: {total_weekly_calories}")
+            logger.info("Generated meal plan with %d days, total calories: %s", len(days), total_weekly_calories)
             return meal_plan
             
         except Exception as e:
-            logger.error(f"Meal plan generation error: {str(e)}")
+            logger.error("Meal plan generation error: %s", e)
             raise ExternalAPIError(f"Failed to generate meal plan: {str(e)}")
@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration for production deployments.
+
+Run with:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+/api/recipes spends most of its time blocked on upstream HTTP (Gemini and
+Spoonacular), so threaded workers let one process keep many requests in
+flight; workers/threads are env-tunable per deployment size.
+"""
+
+import os
+
+bind = "0.0.0.0:" + os.getenv("PORT", "5001")
+# Import the app once in the master and fork workers from it: compiled
+# regexes, prebuilt error bodies and other static data are shared via
+# copy-on-write pages. Services (and their sockets) are constructed
+# lazily on first use, so every worker still gets its own connections.
+preload_app = True
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+
+
+def post_fork(server, worker):
+    # Threads don't survive fork: with preload_app the log-queue
+    # listener thread exists only in the master, so each worker must
+    # restart its own or its log records sit in the queue forever.
+    from main import start_log_listener
+
+    start_log_listener()
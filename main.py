@@ -6,14 +6,27 @@ duplicated decorators and misplaced functions by providing a single
 definition for each auth endpoint.
 """
 
+import atexit
 import os
 import logging
+import logging.handlers
 import json
+import gzip
+import queue
+import time
+import orjson
 from datetime import datetime, timedelta
-from flask import Flask, request, jsonify, g
+from collections import namedtuple
+from functools import cached_property, wraps
+from threading import Lock, RLock
+from flask import Flask, Response, request, jsonify, g
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 from dotenv import load_dotenv
+from cachetools import LRUCache, TTLCache
+import hashlib
 import jwt
+from sqlalchemy import case, update
 from app_models import (
     UserInput,
     ValidationError,
@@ -26,6 +39,7 @@ from app_models import (
     ChatMessage,
     SessionLocal,
     init_db,
+    serialize,
     GeneratedMealPlan,
     DayMeals,
     Meal,
@@ -33,17 +47,83 @@ from app_models import (
 from app_services import GeminiService, SpoonacularService, RecipeService, MealPlanService
 
 load_dotenv()
-init_db()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+# Configure logging: request threads enqueue records onto an unbounded
+# queue and a background listener thread does the actual stream writes,
+# so logging never blocks a worker on stderr I/O.
+_log_queue = queue.Queue(-1)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 )
+_root_logger = logging.getLogger()
+_root_logger.setLevel(logging.INFO)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_root_logger.addHandler(_queue_handler)
+_log_listener = None
+_log_listener_pid = None
+
+
+def start_log_listener():
+    """(Re)start the log drain thread for the current process.
+
+    Threads do not survive fork: with gunicorn's preload_app the
+    listener started in the master does not exist inside the workers,
+    and their records would pile up in the queue unwritten. The
+    post_fork hook calls this so each worker gets its own drain thread;
+    idempotent per process. A forked child also gets a fresh queue —
+    the inherited one still carries the master listener's dead thread
+    in its condition waiters, so puts would notify a ghost and the new
+    listener would never wake.
+    """
+    global _log_queue, _log_listener, _log_listener_pid
+    if _log_listener_pid == os.getpid():
+        return
+    if _log_listener is not None:
+        stale, _log_queue = _log_queue, queue.Queue(-1)
+        _queue_handler.queue = _log_queue
+        try:
+            while True:
+                _log_queue.put_nowait(stale.get_nowait())
+        except queue.Empty:
+            pass
+    _log_listener = logging.handlers.QueueListener(
+        _log_queue, _stream_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    _log_listener_pid = os.getpid()
+
+
+def _stop_log_listener():
+    # Only the process that started this listener may stop it; a forked
+    # child inherits the parent's atexit entry but not its thread.
+    if _log_listener is not None and _log_listener_pid == os.getpid():
+        _log_listener.stop()
+
+
+start_log_listener()
+atexit.register(_stop_log_listener)
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Every jsonify() call goes through this, so responses encode in C
+    instead of stdlib json's pure-Python walk. orjson also serializes
+    datetimes natively, which matches the isoformat strings to_dict
+    methods already emit.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "dev_secret")
 
 # CORS configuration - configure for production
@@ -63,15 +143,183 @@ SPOONACULAR_API_KEY = os.getenv("SPOONACULAR_API_KEY")
 if not GOOGLE_API_KEY or not SPOONACULAR_API_KEY:
     logger.warning("Missing API keys - app may not function fully in dev")
 
-gemini_service = GeminiService(GOOGLE_API_KEY)
-spoonacular_service = SpoonacularService(SPOONACULAR_API_KEY)
-recipe_service = RecipeService(gemini_service, spoonacular_service)
-meal_plan_service = MealPlanService(gemini_service, spoonacular_service)
+class _ServiceRegistry:
+    """Lazily constructed service singletons.
+
+    Nothing here opens sockets or builds SDK clients until the first
+    request that needs them, so /health answers immediately after boot and
+    workers fork fast under scale-to-zero hosts.
+    """
+
+    @cached_property
+    def gemini(self):
+        return GeminiService(GOOGLE_API_KEY)
+
+    @cached_property
+    def spoonacular(self):
+        return SpoonacularService(SPOONACULAR_API_KEY)
+
+    @cached_property
+    def recipe(self):
+        return RecipeService(self.gemini, self.spoonacular)
+
+    @cached_property
+    def meal_plan(self):
+        return MealPlanService(self.gemini, self.spoonacular)
+
+
+services = _ServiceRegistry()
 
 start_time = datetime.now()
+# Monotonic uptime reference: health checks are polled constantly, and
+# monotonic subtraction is cheaper than wall-clock math and immune to
+# clock adjustments.
+_START_MONO = time.monotonic()
+
+# Response cache for /api/recipes: identical inputs produce identical
+# recommendations, so repeat submissions skip the Gemini + Spoonacular
+# round-trips entirely. Keyed on the normalized user input.
+_RECIPE_CACHE = TTLCache(maxsize=1024, ttl=3600)
+_RECIPE_CACHE_LOCK = RLock()
+
+
+# Negative cache for invalid /api/recipes payloads: scanners and broken
+# clients resend identical bad bodies, and each one otherwise pays the
+# JSON parse + validation walk. Keyed by a hash of the raw body.
+_BAD_BODY_CACHE = LRUCache(maxsize=2048)
+
+# Error bodies are constant, so encode them once at import; handlers wrap
+# the bytes in a fresh Response per request (flask_cors and Werkzeug
+# mutate response headers, so the Response object itself can't be shared).
+_UNAUTHORIZED_BODY = orjson.dumps({"error": "Unauthorized"})
+_PROFILE_NOT_FOUND_BODY = orjson.dumps({"error": "Profile not found"})
+_MEAL_PLAN_NOT_FOUND_BODY = orjson.dumps({"error": "Meal plan not found"})
+_GROCERY_LIST_NOT_FOUND_BODY = orjson.dumps({"error": "Grocery list not found"})
+
+
+def _not_found(body):
+    """404 wrapping one of the pre-encoded not-found bodies.
+
+    A fresh Response per request, same as the error handlers: flask_cors
+    and Werkzeug mutate headers, so the Response object itself can't be
+    shared, but the dict build and JSON encode can."""
+    return Response(body, status=404, mimetype="application/json")
+_BAD_REQUEST_BODY = orjson.dumps({"success": False, "error": "Bad request"})
+_NOT_FOUND_BODY = orjson.dumps({"success": False, "error": "Endpoint not found"})
+_SERVER_ERROR_BODY = orjson.dumps({"success": False, "error": "Internal server error"})
+
+
+# Bodies smaller than this aren't worth the compression round-trip.
+_COMPRESS_MIN_SIZE = 500
+
+
+def _recipe_response(body, gz_body, etag=None):
+    """Pick the precompressed body when the client accepts gzip."""
+    if gz_body is not None and "gzip" in request.headers.get("Accept-Encoding", ""):
+        resp = Response(gz_body, status=200, mimetype="application/json")
+        resp.headers["Content-Encoding"] = "gzip"
+        resp.headers["Vary"] = "Accept-Encoding"
+    else:
+        resp = Response(body, status=200, mimetype="application/json")
+    if etag is not None:
+        resp.headers["ETag"] = etag
+        resp.headers["Cache-Control"] = "private, max-age=3600"
+    return resp
+
+
+def _etag_json(body):
+    """JSON response carrying a weak body-hash ETag, or 304 on a match.
+
+    For polling clients (profile, meal-plan and chat views refetch on
+    focus) a matched If-None-Match sheds the whole body; the serialize
+    work already happened, but the bytes never cross the wire.
+    """
+    etag = 'W/"%s"' % hashlib.blake2b(body, digest_size=8).hexdigest()
+    if request.headers.get("If-None-Match") == etag:
+        resp = Response(status=304)
+    else:
+        resp = Response(body, mimetype="application/json")
+    resp.headers["ETag"] = etag
+    return resp
+
+
+def _recipe_cache_key(user_input):
+    """Normalized, allergy-order-independent key for the response cache."""
+    return (
+        user_input.height_cm,
+        user_input.weight_kg,
+        tuple(sorted(a.lower() for a in user_input.allergies)),
+        user_input.food_preferences.strip().lower(),
+        user_input.diet_goals.strip().lower(),
+    )
+
+
+# Authenticated-user cache: get_current_user() otherwise costs a DB
+# round-trip on every authenticated endpoint. Entries are lightweight
+# detached tuples carrying the only fields endpoints read; anything that
+# changes a user's row must evict its entry.
+_CachedUser = namedtuple("_CachedUser", ["id", "email", "role", "created_at", "profile"])
+_USER_CACHE = TTLCache(maxsize=5000, ttl=60)
+_USER_CACHE_LOCK = Lock()
+
+
+# Verified-password cache: bcrypt is ~100ms of deliberate CPU per check,
+# so a client retrying the same credentials (page refresh, multi-tab
+# login) repays the full cost each time. Key on a hash of password plus
+# the stored bcrypt hash — a password change rotates the hash and thus
+# the key — and cache only successes, briefly.
+_PW_VERIFY_CACHE = TTLCache(maxsize=1000, ttl=30)
+_PW_VERIFY_LOCK = Lock()
+
+
+def _verify_password_cached(user, password):
+    key = hashlib.blake2b(
+        password.encode() + user.password_hash.encode(), digest_size=16
+    ).digest()
+    with _PW_VERIFY_LOCK:
+        if key in _PW_VERIFY_CACHE:
+            return True
+    if not user.verify_password(password):
+        return False
+    with _PW_VERIFY_LOCK:
+        _PW_VERIFY_CACHE[key] = True
+    return True
+
+
+# Verified-JWT cache: a client typically sends the same token on every
+# request, and each decode is an HMAC verify plus a JSON parse. A few
+# seconds of reuse removes that work from the hot authenticated path.
+# Only successful verifications are cached, and the exp claim is
+# re-checked on every hit so expiry semantics are preserved.
+_JWT_CACHE = TTLCache(maxsize=10000, ttl=5)
+_JWT_CACHE_LOCK = Lock()
+
+
+def _parse_body():
+    """Decode a request body straight from the raw bytes with orjson.
+
+    Skips Werkzeug's mimetype negotiation and body caching on the
+    credential endpoints, which are hit on every session start. Invalid
+    or empty bodies fall through to {} so the field checks below produce
+    the usual 400s.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+# JWT helpers. One PyJWT instance with the signing key pre-encoded skips
+# the algorithm re-lookup and str->bytes conversion that the module-level
+# jwt.encode/jwt.decode helpers perform on every call.
+_JWT = jwt.PyJWT()
+_JWT_KEY = app.config["SECRET_KEY"].encode()
 
 
-# JWT helpers
 def create_access_token(user_id, role, expires_delta=None):
     # Default expiration: 2 days (if not provided)
     if expires_delta is None:
@@ -79,18 +327,32 @@ def create_access_token(user_id, role, expires_delta=None):
     payload = {
         "user_id": user_id,
         "role": role,
-        "exp": datetime.utcnow() + expires_delta,
+        # Integer epoch directly; a datetime here makes PyJWT do the
+        # timestamp conversion itself on every encode.
+        "exp": int(time.time() + expires_delta.total_seconds()),
     }
-    return jwt.encode(payload, app.config["SECRET_KEY"], algorithm="HS256")
+    return _JWT.encode(payload, _JWT_KEY, algorithm="HS256")
 
 
 def decode_access_token(token):
+    key = hashlib.sha256(token.encode()).digest()
+    with _JWT_CACHE_LOCK:
+        payload = _JWT_CACHE.get(key)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        with _JWT_CACHE_LOCK:
+            _JWT_CACHE.pop(key, None)
+        return None
     try:
-        return jwt.decode(token, app.config["SECRET_KEY"], algorithms=["HS256"])
+        payload = _JWT.decode(token, _JWT_KEY, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
         return None
+    with _JWT_CACHE_LOCK:
+        _JWT_CACHE[key] = payload
+    return payload
 
 
 def get_db():
@@ -107,22 +369,62 @@ def remove_db(exception=None):
 
 
 def get_current_user():
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not auth_header.startswith("Bearer "):
+    auth_header = request.headers.get("Authorization", "")
+    if not auth_header.startswith("Bearer "):
         return None
-    token = auth_header.split(" ")[1]
+    # The prefix is fixed-width, so slice instead of split (no list alloc)
+    token = auth_header[7:]
     payload = decode_access_token(token)
     if not payload:
         return None
+    user_id = payload.get("user_id")
+    with _USER_CACHE_LOCK:
+        cached = _USER_CACHE.get(user_id)
+    if cached is not None:
+        return cached
     db = get_db()
-    return db.query(User).filter(User.id == payload.get("user_id")).first()
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is not None:
+        # user.profile is already loaded by the joined relationship, so
+        # caching its dict costs no extra query.
+        with _USER_CACHE_LOCK:
+            _USER_CACHE[user_id] = _CachedUser(
+                user.id, user.email, user.role, user.created_at,
+                user.profile.to_dict() if user.profile else None,
+            )
+    return user
+
+
+def require_auth(view):
+    """Reject unauthenticated requests before the view body runs.
+
+    The resolved user is stashed on flask.g for the request, so a view
+    (or anything it calls) can read g.current_user without repeating the
+    token dance, and the 401 body is the shared pre-encoded bytes.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        user = get_current_user()
+        if user is None:
+            return Response(_UNAUTHORIZED_BODY, status=401, mimetype="application/json")
+        g.current_user = user
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def _profile_dict(user):
+    """Profile as a dict for either a cached user or an ORM User."""
+    profile = user.profile
+    if profile is None or isinstance(profile, dict):
+        return profile
+    return profile.to_dict()
 
 
 # --- AUTH ENDPOINTS ---
 @app.route("/api/auth/register", methods=["POST"])
 def register():
     db = get_db()
-    data = request.get_json() or {}
+    data = _parse_body()
     email = data.get("email")
     password = data.get("password")
     first_name = data.get("firstName")
@@ -138,10 +440,10 @@ def register():
     password_hash = User.hash_password(password)
     user = User(email=email, password_hash=password_hash)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    # flush assigns the PK without ending the transaction, so user and
+    # profile land in one commit (one WAL sync) instead of two
+    db.flush()
 
-    # create profile if provided
     profile = Profile(user_id=user.id, first_name=first_name, gender=gender, zip_code=zip_code)
     db.add(profile)
     db.commit()
@@ -160,7 +462,7 @@ def register():
 @app.route("/api/auth/login", methods=["POST"])
 def login():
     db = get_db()
-    data = request.get_json() or {}
+    data = _parse_body()
     email = data.get("email")
     password = data.get("password")
 
@@ -168,12 +470,14 @@ def login():
         return jsonify({"error": "Email and password required"}), 400
 
     user = db.query(User).filter(User.email == email).first()
-    if not user or not user.verify_password(password):
+    if not user or not _verify_password_cached(user, password):
         return jsonify({"error": "Incorrect credentials"}), 401
 
     access_token = create_access_token(user.id, user.role)
     user.last_login = datetime.utcnow()
     db.commit()
+    with _USER_CACHE_LOCK:
+        _USER_CACHE.pop(user.id, None)
 
     return (
         jsonify({
@@ -186,15 +490,11 @@ def login():
 
 
 @app.route("/api/auth/me", methods=["GET"])
+@require_auth
 def get_current_user_info():
     """Get current authenticated user's info."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
-    
-    db = get_db()
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-    
+    user = g.current_user
+
     return jsonify({
         "user": {
             "id": user.id,
@@ -202,7 +502,7 @@ def get_current_user_info():
             "role": user.role,
             "created_at": user.created_at.isoformat() if user.created_at else None,
         },
-        "profile": profile.to_dict() if profile else None,
+        "profile": _profile_dict(user),
     }), 200
 
 
@@ -213,11 +513,10 @@ def logout():
 
 
 @app.route("/api/auth/refresh", methods=["POST"])
+@require_auth
 def refresh_token():
     """Refresh access token using current JWT."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     new_access_token = create_access_token(user.id, user.role)
     return jsonify({
@@ -228,31 +527,28 @@ def refresh_token():
 
 # --- PROFILE ENDPOINTS ---
 @app.route("/api/profile", methods=["GET"])
+@require_auth
 def get_profile():
     """Get user profile."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
-    
-    db = get_db()
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
+    user = g.current_user
+
+    profile = _profile_dict(user)
     if not profile:
-        return jsonify({"error": "Profile not found"}), 404
-    
-    return jsonify(profile.to_dict()), 200
+        return _not_found(_PROFILE_NOT_FOUND_BODY)
+
+    return _etag_json(serialize(profile))
 
 
 @app.route("/api/profile", methods=["PUT", "PATCH"])
+@require_auth
 def update_profile():
     """Update user profile."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     profile = db.query(Profile).filter(Profile.user_id == user.id).first()
     if not profile:
-        return jsonify({"error": "Profile not found"}), 404
+        return _not_found(_PROFILE_NOT_FOUND_BODY)
     
     data = request.get_json() or {}
     
@@ -272,14 +568,19 @@ def update_profile():
     if "weight_kg" in data:
         profile.weight_kg = data["weight_kg"]
     if "allergies" in data:
-        profile.allergies = json.dumps(data["allergies"])
+        profile.allergies = data["allergies"]
     if "food_preferences" in data:
         profile.food_preferences = data["food_preferences"]
     if "diet_goals" in data:
         profile.diet_goals = data["diet_goals"]
     
     db.commit()
-    
+    # The user cache carries the profile dict, so a profile edit must
+    # evict the entry or reads would serve the stale profile for up to
+    # the cache TTL.
+    with _USER_CACHE_LOCK:
+        _USER_CACHE.pop(user.id, None)
+
     return jsonify({
         "message": "Profile updated successfully",
         "profile": profile.to_dict(),
@@ -310,8 +611,19 @@ def get_recipes():
     }
     """
     try:
-        # Parse and validate request JSON
-        data = request.get_json()
+        # Parse the body straight from the raw bytes: skips Werkzeug's
+        # content-type negotiation and its cached-dict slot on the request.
+        raw = request.get_data(cache=False)
+        body_hash = hashlib.blake2b(raw, digest_size=16).digest() if raw else None
+        if body_hash is not None:
+            with _RECIPE_CACHE_LOCK:
+                bad = _BAD_BODY_CACHE.get(body_hash)
+            if bad is not None:
+                return Response(bad, status=400, mimetype="application/json")
+        try:
+            data = orjson.loads(raw) if raw else None
+        except orjson.JSONDecodeError:
+            data = None
         if not data:
             logger.warning("Empty request body")
             return jsonify({
@@ -319,30 +631,50 @@ def get_recipes():
                 "error": "Request body must be JSON"
             }), 400
         
-        logger.info(f"Processing recipe request - height: {data.get('height_cm')}, weight: {data.get('weight_kg')}")
+        logger.info("Processing recipe request - height: %s, weight: %s", data.get("height_cm"), data.get("weight_kg"))
         
         # Validate user input
         try:
             user_input = UserInput.from_dict(data)
         except ValidationError as e:
-            logger.warning(f"Validation error: {e.message}")
-            return jsonify({
+            logger.warning("Validation error: %s", e.message)
+            body = orjson.dumps({
                 "success": False,
                 "error": e.message,
                 "field": e.field
-            }), 400
+            })
+            # Remember the verdict for this exact body so repeats are
+            # rejected without re-parsing or re-validating.
+            if body_hash is not None:
+                with _RECIPE_CACHE_LOCK:
+                    _BAD_BODY_CACHE[body_hash] = body
+            return Response(body, status=400, mimetype="application/json")
         
+        # Serve identical requests from the response cache: a hit skips the
+        # Gemini and Spoonacular round-trips entirely.
+        cache_key = _recipe_cache_key(user_input)
+        with _RECIPE_CACHE_LOCK:
+            cached = _RECIPE_CACHE.get(cache_key)
+        if cached is not None:
+            body, gz_body, etag = cached
+            # The client already holds this exact representation: skip
+            # the transfer entirely.
+            if request.headers.get("If-None-Match") == etag:
+                return Response(status=304, headers={"ETag": etag})
+            logger.info("Recipe response cache hit")
+            return _recipe_response(body, gz_body, etag=etag)
+
         # Get recipes
         try:
-            parsed_ingredients, recipes, metrics = recipe_service.get_recipes_for_user(user_input)
+            parsed_ingredients, recipes, metrics = services.recipe.get_recipes_for_user(user_input)
         except ExternalAPIError as e:
-            logger.error(f"External API error: {e.message}")
+            logger.error("External API error: %s", e.message)
             return jsonify({
                 "success": False,
                 "error": e.message,
                 "type": "external_api_error"
             }), 500
-        
+
         # Build response
         response = {
             "success": True,
@@ -351,12 +683,26 @@ def get_recipes():
             "recipe_count": len(recipes),
             "recipes": [r.to_dict() for r in recipes]
         }
-        
-        logger.info(f"Successfully returned {len(recipes)} recipes")
-        return jsonify(response), 200
+
+        # Cache the fully encoded body so hits skip the to_dict() walk and
+        # the JSON encode pass, not just the external calls. Recipe JSON is
+        # text-heavy and compresses 5-10x, so a gzip variant is compressed
+        # once here and reused for every gzip-capable client.
+        body = orjson.dumps(response)
+        gz_body = gzip.compress(body) if len(body) >= _COMPRESS_MIN_SIZE else None
+        # ETag identifies the representation, not the input: hash the
+        # encoded body (as _etag_json does) so a rebuild after TTL expiry
+        # with fresh upstream data changes the validator, and keep it
+        # with the entry so revalidation matches exactly what's served.
+        etag = 'W/"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest()
+        with _RECIPE_CACHE_LOCK:
+            _RECIPE_CACHE[cache_key] = (body, gz_body, etag)
+
+        logger.info("Successfully returned %d recipes", len(recipes))
+        return _recipe_response(body, gz_body, etag=etag)
         
     except Exception as e:
-        logger.exception(f"Unexpected error in /api/recipes: {str(e)}")
+        logger.exception("Unexpected error in /api/recipes: %s", e)
         return jsonify({
             "success": False,
             "error": "Internal server error",
@@ -364,34 +710,42 @@ def get_recipes():
         }), 500
 
 
-@app.route("/api/recipes", methods=["OPTIONS"])
-def handle_preflight():
-    """Handle CORS preflight requests."""
-    return "", 200
-
-
 # --- MEAL PLAN ENDPOINTS ---
 @app.route("/api/meal-plans", methods=["GET"])
+@require_auth
 def list_meal_plans():
     """List all meal plans for authenticated user."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
-    meal_plans = db.query(MealPlan).filter(MealPlan.user_id == user.id).all()
-    
-    return jsonify({
-        "meal_plans": [mp.to_dict() for mp in meal_plans]
-    }), 200
+    # Column tuples skip ORM instance construction per row; orjson renders
+    # the datetimes, so no isoformat() pass either.
+    rows = db.query(
+        MealPlan.id, MealPlan.user_id, MealPlan.name, MealPlan.description,
+        MealPlan.meals, MealPlan.is_active, MealPlan.created_at, MealPlan.updated_at,
+    ).filter(MealPlan.user_id == user.id).all()
+    meal_plans = [
+        {
+            "id": row.id,
+            "userId": row.user_id,
+            "name": row.name,
+            "description": row.description,
+            "meals": row.meals if row.meals else [],
+            "isActive": row.is_active,
+            "createdAt": row.created_at,
+            "updatedAt": row.updated_at,
+        }
+        for row in rows
+    ]
+
+    return _etag_json(serialize({"meal_plans": meal_plans}))
 
 
 @app.route("/api/meal-plans", methods=["POST"])
+@require_auth
 def create_meal_plan():
     """Create a new meal plan."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     data = request.get_json() or {}
@@ -400,7 +754,7 @@ def create_meal_plan():
         user_id=user.id,
         name=data.get("name", "Untitled Meal Plan"),
         description=data.get("description", ""),
-        meals=json.dumps(data.get("meals", [])),  # Serialize meals to JSON
+        meals=data.get("meals", []),  # JSON column; the engine serializes
     )
     db.add(meal_plan)
     db.commit()
@@ -412,11 +766,10 @@ def create_meal_plan():
 
 
 @app.route("/api/meal-plans/<int:meal_plan_id>", methods=["GET"])
+@require_auth
 def get_meal_plan(meal_plan_id):
     """Get a specific meal plan."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     meal_plan = db.query(MealPlan).filter(
@@ -425,17 +778,16 @@ def get_meal_plan(meal_plan_id):
     ).first()
     
     if not meal_plan:
-        return jsonify({"error": "Meal plan not found"}), 404
+        return _not_found(_MEAL_PLAN_NOT_FOUND_BODY)
     
-    return jsonify(meal_plan.to_dict()), 200
+    return _etag_json(serialize(meal_plan.to_dict()))
 
 
 @app.route("/api/meal-plans/<int:meal_plan_id>", methods=["PUT", "PATCH"])
+@require_auth
 def update_meal_plan(meal_plan_id):
     """Update a meal plan."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     meal_plan = db.query(MealPlan).filter(
@@ -444,7 +796,7 @@ def update_meal_plan(meal_plan_id):
     ).first()
     
     if not meal_plan:
-        return jsonify({"error": "Meal plan not found"}), 404
+        return _not_found(_MEAL_PLAN_NOT_FOUND_BODY)
     
     data = request.get_json() or {}
     
@@ -453,7 +805,7 @@ def update_meal_plan(meal_plan_id):
     if "description" in data:
         meal_plan.description = data["description"]
     if "meals" in data:
-        meal_plan.meals = json.dumps(data["meals"])
+        meal_plan.meals = data["meals"]
     
     db.commit()
     
@@ -464,11 +816,10 @@ def update_meal_plan(meal_plan_id):
 
 
 @app.route("/api/meal-plans/<int:meal_plan_id>/activate", methods=["POST"])
+@require_auth
 def activate_meal_plan(meal_plan_id):
     """Activate a meal plan."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     meal_plan = db.query(MealPlan).filter(
@@ -477,16 +828,18 @@ def activate_meal_plan(meal_plan_id):
     ).first()
     
     if not meal_plan:
-        return jsonify({"error": "Meal plan not found"}), 404
-    
-    # Deactivate all other meal plans
-    db.query(MealPlan).filter(
-        MealPlan.user_id == user.id,
-        MealPlan.id != meal_plan_id
-    ).update({"is_active": False})
+        return _not_found(_MEAL_PLAN_NOT_FOUND_BODY)
     
-    meal_plan.is_active = True
+    # One statement flips the whole set: the target row becomes active and
+    # every other plan of the user is deactivated, instead of a bulk UPDATE
+    # plus a second UPDATE for the mutated instance at commit.
+    db.execute(
+        update(MealPlan)
+        .where(MealPlan.user_id == user.id)
+        .values(is_active=case((MealPlan.id == meal_plan_id, True), else_=False))
+    )
     db.commit()
+    db.refresh(meal_plan)
     
     return jsonify({
         "message": "Meal plan activated",
@@ -495,11 +848,10 @@ def activate_meal_plan(meal_plan_id):
 
 
 @app.route("/api/meal-plans/<int:meal_plan_id>/grocery-list", methods=["GET"])
+@require_auth
 def get_meal_plan_grocery_list(meal_plan_id):
     """Get grocery list for a meal plan."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     grocery_list = db.query(GroceryList).filter(
@@ -508,17 +860,16 @@ def get_meal_plan_grocery_list(meal_plan_id):
     ).first()
     
     if not grocery_list:
-        return jsonify({"error": "Grocery list not found"}), 404
+        return _not_found(_GROCERY_LIST_NOT_FOUND_BODY)
     
     return jsonify(grocery_list.to_dict()), 200
 
 
 @app.route("/api/meal-plans/generate", methods=["POST"])
+@require_auth
 def generate_meal_plan():
     """Generate a new AI-powered meal plan based on user preferences and budget."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     try:
         db = get_db()
@@ -537,10 +888,7 @@ def generate_meal_plan():
         # Use profile data if available and not overridden
         if profile:
             if not allergies and profile.allergies:
-                try:
-                    allergies = json.loads(profile.allergies)
-                except Exception:
-                    allergies = []
+                allergies = profile.allergies
             
             if not diet_goals and profile.diet_goals:
                 diet_goals = profile.diet_goals
@@ -559,10 +907,10 @@ def generate_meal_plan():
                 "error": "Budget must be a positive number."
             }), 400
         
-        logger.info(f"Generating meal plan for user {user.id} - Budget: ${budget}, Diet goals: {diet_goals}")
+        logger.info("Generating meal plan for user %s - Budget: $%s, Diet goals: %s", user.id, budget, diet_goals)
         
         # Generate the meal plan using AI
-        generated_meal_plan = meal_plan_service.generate_weekly_meal_plan(
+        generated_meal_plan = services.meal_plan.generate_weekly_meal_plan(
             budget=budget,
             allergies=allergies,
             diet_goals=diet_goals,
@@ -576,7 +924,8 @@ def generate_meal_plan():
                 user_id=user.id,
                 name=generated_meal_plan.name,
                 description=f"AI-generated meal plan for budget ${budget}/week with goals: {diet_goals}",
-                meals=json.dumps(generated_meal_plan.to_dict())
+                meals=generated_meal_plan.to_dict(),
+                is_ai_generated=True,
             )
             db.add(meal_plan_db)
             db.commit()
@@ -584,7 +933,7 @@ def generate_meal_plan():
             # Update the generated meal plan ID to match the database ID
             generated_meal_plan.id = str(meal_plan_db.id)
         
-        logger.info(f"Successfully generated meal plan with {len(generated_meal_plan.days)} days")
+        logger.info("Successfully generated meal plan with %d days", len(generated_meal_plan.days))
         
         return jsonify({
             "success": True,
@@ -592,7 +941,7 @@ def generate_meal_plan():
         }), 200
         
     except ExternalAPIError as e:
-        logger.error(f"External API error during meal plan generation: {e.message}")
+        logger.error("External API error during meal plan generation: %s", e.message)
         return jsonify({
             "success": False,
             "error": e.message,
@@ -600,7 +949,7 @@ def generate_meal_plan():
         }), 500
         
     except Exception as e:
-        logger.exception(f"Unexpected error in meal plan generation: {str(e)}")
+        logger.exception("Unexpected error in meal plan generation: %s", e)
         return jsonify({
             "success": False,
             "error": "Internal server error during meal plan generation",
@@ -609,55 +958,55 @@ def generate_meal_plan():
 
 
 @app.route("/api/meal-plans/generated", methods=["GET"])
+@require_auth
 def get_generated_meal_plans():
     """Get all AI-generated meal plans for authenticated user."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     try:
         db = get_db()
         
-        # Query meal plans that contain AI-generated data (indicated by description containing "AI-generated")
-        meal_plans = db.query(MealPlan).filter(
+        # Indexed equality on the dedicated flag instead of a LIKE scan
+        # over description. Column tuple keeps the loop below working
+        # (same attribute names) without building a mapped instance per row.
+        meal_plans = db.query(
+            MealPlan.id, MealPlan.name, MealPlan.description,
+            MealPlan.meals, MealPlan.is_active, MealPlan.created_at,
+        ).filter(
             MealPlan.user_id == user.id,
-            MealPlan.description.contains("AI-generated")
+            MealPlan.is_ai_generated.is_(True),
         ).order_by(MealPlan.created_at.desc()).all()
         
         generated_meal_plans = []
         
         for meal_plan in meal_plans:
-            try:
-                # Parse the stored JSON data which contains the full GeneratedMealPlan structure
-                if meal_plan.meals:
-                    meal_data = json.loads(meal_plan.meals)
-                    
-                    # If it's a nested structure (GeneratedMealPlan was stored as JSON), extract it
-                    if isinstance(meal_data, dict) and 'id' in meal_data and 'days' in meal_data:
-                        # This is a full GeneratedMealPlan object
-                        generated_meal_plans.append(meal_data)
-                    else:
-                        # This might be a regular meal plan, convert to GeneratedMealPlan format
-                        generated_meal_plans.append({
-                            "id": str(meal_plan.id),
-                            "name": meal_plan.name,
-                            "description": meal_plan.description,
-                            "startDate": meal_plan.created_at.strftime("%Y-%m-%d") if meal_plan.created_at else "",
-                            "endDate": "",
-                            "isActive": meal_plan.is_active,
-                            "days": meal_data if isinstance(meal_data, list) else [],
-                            "weeklyBudget": 0.0,
-                            "totalCalories": 0,
-                            "totalProtein": 0.0,
-                            "totalCarbs": 0.0,
-                            "totalFat": 0.0
-                        })
-                        
-            except json.JSONDecodeError as e:
-                logger.warning(f"Failed to parse meal plan {meal_plan.id} data: {e}")
+            # The JSON column hands back the stored structure directly
+            meal_data = meal_plan.meals
+            if not meal_data:
                 continue
+
+            # If it's a nested structure (GeneratedMealPlan was stored as JSON), extract it
+            if isinstance(meal_data, dict) and 'id' in meal_data and 'days' in meal_data:
+                # This is a full GeneratedMealPlan object
+                generated_meal_plans.append(meal_data)
+            else:
+                # This might be a regular meal plan, convert to GeneratedMealPlan format
+                generated_meal_plans.append({
+                    "id": str(meal_plan.id),
+                    "name": meal_plan.name,
+                    "description": meal_plan.description,
+                    "startDate": meal_plan.created_at.strftime("%Y-%m-%d") if meal_plan.created_at else "",
+                    "endDate": "",
+                    "isActive": meal_plan.is_active,
+                    "days": meal_data if isinstance(meal_data, list) else [],
+                    "weeklyBudget": 0.0,
+                    "totalCalories": 0,
+                    "totalProtein": 0.0,
+                    "totalCarbs": 0.0,
+                    "totalFat": 0.0
+                })
         
-        logger.info(f"Retrieved {len(generated_meal_plans)} generated meal plans for user {user.id}")
+        logger.info("Retrieved %d generated meal plans for user %s", len(generated_meal_plans), user.id)
         
         return jsonify({
             "success": True,
@@ -666,7 +1015,7 @@ def get_generated_meal_plans():
         }), 200
         
     except Exception as e:
-        logger.exception(f"Unexpected error retrieving generated meal plans: {str(e)}")
+        logger.exception("Unexpected error retrieving generated meal plans: %s", e)
         return jsonify({
             "success": False,
             "error": "Internal server error retrieving meal plans",
@@ -676,34 +1025,53 @@ def get_generated_meal_plans():
 
 # --- GROCERY LIST ENDPOINTS ---
 @app.route("/api/grocery-lists", methods=["GET"])
+@require_auth
 def list_grocery_lists():
     """List all grocery lists for authenticated user."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
-    grocery_lists = db.query(GroceryList).filter(GroceryList.user_id == user.id).all()
-    
-    return jsonify({
-        "grocery_lists": [gl.to_dict() for gl in grocery_lists]
-    }), 200
+    rows = db.query(
+        GroceryList.id, GroceryList.user_id, GroceryList.meal_plan_id,
+        GroceryList.items, GroceryList.created_at, GroceryList.updated_at,
+    ).filter(GroceryList.user_id == user.id).all()
+    grocery_lists = [
+        {
+            "id": row.id,
+            "userId": row.user_id,
+            "mealPlanId": row.meal_plan_id,
+            "items": row.items if row.items else [],
+            "createdAt": row.created_at,
+            "updatedAt": row.updated_at,
+        }
+        for row in rows
+    ]
+
+    return _etag_json(serialize({"grocery_lists": grocery_lists}))
 
 
 @app.route("/api/grocery-lists", methods=["POST"])
+@require_auth
 def create_grocery_list():
     """Create a new grocery list."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     data = request.get_json() or {}
     
+    # JSON column: lists are stored natively; string payloads from older
+    # clients are parsed so reads stay uniform
+    items = data.get("items", [])
+    if isinstance(items, str):
+        try:
+            items = json.loads(items)
+        except Exception:
+            items = []
+
     grocery_list = GroceryList(
         user_id=user.id,
         meal_plan_id=data.get("mealPlanId"),
-        items=json.dumps(data.get("items", [])) if isinstance(data.get("items"), list) else data.get("items", "[]"),
+        items=items,
     )
     db.add(grocery_list)
     db.commit()
@@ -715,11 +1083,10 @@ def create_grocery_list():
 
 
 @app.route("/api/grocery-lists/<int:grocery_list_id>", methods=["GET"])
+@require_auth
 def get_grocery_list(grocery_list_id):
     """Get a specific grocery list."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     grocery_list = db.query(GroceryList).filter(
@@ -728,17 +1095,16 @@ def get_grocery_list(grocery_list_id):
     ).first()
     
     if not grocery_list:
-        return jsonify({"error": "Grocery list not found"}), 404
+        return _not_found(_GROCERY_LIST_NOT_FOUND_BODY)
     
     return jsonify(grocery_list.to_dict()), 200
 
 
 @app.route("/api/grocery-lists/<int:grocery_list_id>", methods=["PUT", "PATCH"])
+@require_auth
 def update_grocery_list(grocery_list_id):
     """Update a grocery list."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     grocery_list = db.query(GroceryList).filter(
@@ -747,12 +1113,18 @@ def update_grocery_list(grocery_list_id):
     ).first()
     
     if not grocery_list:
-        return jsonify({"error": "Grocery list not found"}), 404
+        return _not_found(_GROCERY_LIST_NOT_FOUND_BODY)
     
     data = request.get_json() or {}
     
     if "items" in data:
-        grocery_list.items = json.dumps(data["items"]) if isinstance(data["items"], list) else data["items"]
+        items = data["items"]
+        if isinstance(items, str):
+            try:
+                items = json.loads(items)
+            except Exception:
+                items = []
+        grocery_list.items = items
     
     db.commit()
     
@@ -764,11 +1136,10 @@ def update_grocery_list(grocery_list_id):
 
 # --- CHAT ENDPOINTS ---
 @app.route("/api/chat/parse", methods=["POST"])
+@require_auth
 def parse_chat():
     """Parse user chat message and return response."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
     data = request.get_json() or {}
@@ -797,28 +1168,37 @@ def parse_chat():
 
 
 @app.route("/api/chat/history", methods=["GET"])
+@require_auth
 def get_chat_history():
     """Get chat history for authenticated user."""
-    user = get_current_user()
-    if not user:
-        return jsonify({"error": "Unauthorized"}), 401
+    user = g.current_user
     
     db = get_db()
-    messages = db.query(ChatMessage).filter(ChatMessage.user_id == user.id).all()
-    
-    return jsonify({
-        "chat_history": [msg.to_dict() for msg in messages]
-    }), 200
+    rows = db.query(
+        ChatMessage.id, ChatMessage.user_id, ChatMessage.message,
+        ChatMessage.response, ChatMessage.created_at,
+    ).filter(ChatMessage.user_id == user.id).all()
+    chat_history = [
+        {
+            "id": row.id,
+            "userId": row.user_id,
+            "message": row.message,
+            "response": row.response,
+            "createdAt": row.created_at,
+        }
+        for row in rows
+    ]
+
+    return _etag_json(serialize({"chat_history": chat_history}))
 
 
 # --- UTILITY ENDPOINTS ---
 @app.route("/health", methods=["GET"])
 def health_check():
     """Health check endpoint for deployment monitoring."""
-    uptime_seconds = (datetime.now() - start_time).total_seconds()
     return jsonify({
         "status": "ok",
-        "uptime_seconds": int(uptime_seconds),
+        "uptime_seconds": int(time.monotonic() - _START_MONO),
         "timestamp": datetime.now().isoformat()
     }), 200
 
@@ -826,39 +1206,44 @@ def health_check():
 @app.errorhandler(400)
 def handle_bad_request(e):
     """Handle 400 errors."""
-    logger.warning(f"Bad request: {str(e)}")
-    return jsonify({
-        "success": False,
-        "error": "Bad request"
-    }), 400
+    logger.warning("Bad request: %s", e)
+    return Response(_BAD_REQUEST_BODY, status=400, mimetype="application/json")
 
 
 @app.errorhandler(404)
 def handle_not_found(e):
     """Handle 404 errors."""
-    return jsonify({
-        "success": False,
-        "error": "Endpoint not found"
-    }), 404
+    return Response(_NOT_FOUND_BODY, status=404, mimetype="application/json")
 
 
 @app.errorhandler(500)
 def handle_server_error(e):
     """Handle 500 errors."""
-    logger.error(f"Server error: {str(e)}")
-    return jsonify({
-        "success": False,
-        "error": "Internal server error"
-    }), 500
+    logger.error("Server error: %s", e)
+    return Response(_SERVER_ERROR_BODY, status=500, mimetype="application/json")
+
+
+def create_app():
+    """Application factory for WSGI servers.
+
+    Routes register on the module-level app above, but the schema check
+    no longer runs as an import side effect: loading main for tooling or
+    profiling touches no database, while wsgi.py (and the dev server
+    below) call this once before serving. Under gunicorn preload the DDL
+    runs in the master and workers fork with it already done.
+    """
+    init_db()
+    return app
 
 
 if __name__ == "__main__":
+    create_app()
     port = int(os.getenv("PORT", 5001))
     debug = os.getenv("FLASK_ENV", "production") == "development"
     
-    logger.info(f"Starting Flask app on port {port} (debug={debug})")
+    logger.info("Starting Flask app on port %s (debug=%s)", port, debug)
     logger.info("CORS allowed origins: * (all sites)")
-    logger.info(f"Gemini API: {'configured' if GOOGLE_API_KEY else 'NOT SET'}")
-    logger.info(f"Spoonacular API: {'configured' if SPOONACULAR_API_KEY else 'NOT SET'}")
+    logger.info("Gemini API: %s", "configured" if GOOGLE_API_KEY else "NOT SET")
+    logger.info("Spoonacular API: %s", "configured" if SPOONACULAR_API_KEY else "NOT SET")
     
     app.run(host="0.0.0.0", port=port, debug=debug)
@@ -0,0 +1,15 @@
+"""
+WSGI entry point for production servers.
+
+Run with gunicorn so concurrent requests execute in parallel instead of
+serializing behind the single-threaded Werkzeug dev server:
+
+    gunicorn -w 4 -k gthread --threads 8 --timeout 30 wsgi:app
+"""
+
+from main import create_app
+
+app = create_app()
+
+if __name__ == "__main__":
+    app.run()